@@ -2,13 +2,16 @@
 
 """
 Simplified PO Line Creator
-Creates Alma PO Line JSON files by collecting all information from user input
+Creates Alma PO Line JSON files by collecting all information from user input,
+or non-interactively from a CSV / JSON Lines file of order records
 """
 
+import csv
 import json
+import math
 import os
 import sys
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import re
 import requests
 from dataclasses import dataclass
@@ -28,6 +31,46 @@ except ImportError:
 load_dotenv()
 console = Console()
 
+# Filename sanitization patterns used by generate_filename()
+_RE_TITLE_BAD = re.compile(r'[^\w\s-]')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_VENDOR_BAD = re.compile(r'[^\w-]')
+
+# Reporting codes (subjects); the tuple feeds autocomplete, the set validation
+_SUBJECTS = (
+    'Archives', 'Architecture', 'Art', 'Biology', 'Book Art', 'Business',
+    'Chemistry', 'Communications', 'Computer Science', 'Cooking', 'Dance',
+    'Data Science', 'Economics', 'Education', 'English Language Studies',
+    'Entrepreneurship', 'Environmental Science', 'Ethnic Studies', 'Fiction',
+    'Game Design', 'General', 'General Science', 'Graphic Novels',
+    'Health Sciences', 'History', 'Juvenile', 'Library Science', 'Mathematics',
+    'Music', 'Philosophy', 'Poetry', 'Political Science', 'Psychology',
+    'Public Policy', 'Religion', 'Sociology', 'Theatre', 'WGSS'
+)
+_SUBJECTS_SET = frozenset(_SUBJECTS)
+
+# Alma order types (code -> description), in the order they are offered
+_ORDER_TYPES = {
+    "PRINTED_BOOK_OT": "Print Book - One Time",
+    "PRINTED_BOOK_SO": "Print Book - Standing Order",
+    "PRINTED_JOURNAL_CO": "Print Journal - Subscription",
+    "MANUSCRIPT": "Manuscript",
+    "MIXED": "Mixed Material",
+    "SCORE_OT": "Musical Score",
+    "VISUAL_MTL_OT": "Visual Material"
+}
+_ORDER_TYPE_CHOICES = [questionary.Choice(desc, code) for code, desc in _ORDER_TYPES.items()]
+
+_MATERIAL_TYPES = ["BOOK", "DVD", "JOURNAL", "OTHER"]
+
+_RECEIVING_CATEGORIES = ["None", "Note", "Interested User", "Reserve", "Display", "Replacement"]
+
+_ADDITIONAL_ORDER_REFERENCE_CHOICES = [
+    questionary.Choice("None", ""),
+    questionary.Choice("pcard purchase", "pcard purchase"),
+    questionary.Choice("punchout purchase", "punchout purchase")
+]
+
 @dataclass
 class AlmaConfig:
     api_key: str
@@ -51,17 +94,6 @@ class AlmaConfig:
 def get_order_information(config: AlmaConfig):
     """Collect all order information from user input."""
     
-    subjects = [
-        'Archives', 'Architecture', 'Art', 'Biology', 'Book Art', 'Business',
-        'Chemistry', 'Communications', 'Computer Science', 'Cooking', 'Dance',
-        'Data Science', 'Economics', 'Education', 'English Language Studies',
-        'Entrepreneurship', 'Environmental Science', 'Ethnic Studies', 'Fiction',
-        'Game Design', 'General', 'General Science', 'Graphic Novels',
-        'Health Sciences', 'History', 'Juvenile', 'Library Science', 'Mathematics',
-        'Music', 'Philosophy', 'Poetry', 'Political Science', 'Psychology',
-        'Public Policy', 'Religion', 'Sociology', 'Theatre', 'WGSS'
-    ]
-    
     console.print(Panel.fit("Order Information", style="bold blue"))
     
     # Basic order info
@@ -80,22 +112,14 @@ def get_order_information(config: AlmaConfig):
     # Order type
     order_type = questionary.select(
         "Order type:",
-        choices=[
-            questionary.Choice("Print Book - One Time", "PRINTED_BOOK_OT"),
-            questionary.Choice("Print Book - Standing Order", "PRINTED_BOOK_SO"),
-            questionary.Choice("Print Journal - Subscription", "PRINTED_JOURNAL_CO"),
-            questionary.Choice("Manuscript", "MANUSCRIPT"),
-            questionary.Choice("Mixed Material", "MIXED"),
-            questionary.Choice("Musical Score", "SCORE_OT"),
-            questionary.Choice("Visual Material", "VISUAL_MTL_OT")
-        ],
+        choices=_ORDER_TYPE_CHOICES,
         default="PRINTED_BOOK_OT"
     ).ask()
     
     # Material type
     material_type = questionary.select(
         "Material type:",
-        choices=["BOOK", "DVD", "JOURNAL", "OTHER"]
+        choices=_MATERIAL_TYPES
     ).ask()
     
     # OCLC search option
@@ -157,17 +181,13 @@ def get_order_information(config: AlmaConfig):
     quantity = questionary.text(
         "Quantity:",
         default="1",
-        validate=lambda text: text.isdigit() and int(text) > 0 or "Must be a positive number"
+        validate=lambda text: validate_quantity(text)
     ).ask()
     
     # Additional order reference
     additional_order_ref = questionary.select(
         "Additional order reference:",
-        choices=[
-            questionary.Choice("None", ""),
-            questionary.Choice("pcard purchase", "pcard purchase"),
-            questionary.Choice("punchout purchase", "punchout purchase")
-        ]
+        choices=_ADDITIONAL_ORDER_REFERENCE_CHOICES
     ).ask()
     
     # Fund
@@ -179,14 +199,14 @@ def get_order_information(config: AlmaConfig):
     
     reporting_code = questionary.autocomplete(
         "Reporting code:",
-        choices=subjects,
-        validate=lambda text: text in subjects or "Please select a valid subject"
+        choices=_SUBJECTS,
+        validate=lambda text: text in _SUBJECTS_SET or "Please select a valid subject"
     ).ask()
     
     # Receiving categories
     receiving_categories = questionary.checkbox(
         "Receiving note categories:",
-        choices=["None", "Note", "Interested User", "Reserve", "Display", "Replacement"],
+        choices=_RECEIVING_CATEGORIES,
         validate=lambda selected: validate_receiving_categories(selected)
     ).ask()
     
@@ -282,27 +302,21 @@ def get_validated_user_id(config: AlmaConfig):
 # JSON GENERATION
 # =============================================================================
 
-def create_po_json(data):
+def create_po_json(data, today: date | None = None):
     """Create the complete PO line JSON structure."""
     price_str = f"{float(data['price']):.2f}"
-    expected_date = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
-    
-    # Map order type codes to descriptions
-    type_descriptions = {
-        "MANUSCRIPT": "Manuscript",
-        "MIXED": "Mixed Material",
-        "PRINTED_BOOK_OT": "Print Book - One Time",
-        "PRINTED_BOOK_SO": "Print Book - Standing Order",
-        "PRINTED_JOURNAL_CO": "Print Journal - Subscription",
-        "SCORE_OT": "Musical Score",
-        "VISUAL_MTL_OT": "Visual Material"
-    }
+    # Expected receipt is 30 days out; callers may pass the batch's date
+    if today is None:
+        today = date.today()
+    expected_date = (today + timedelta(days=30)).isoformat()
+    # Line price and fund amount are identical, so both reference one dict
+    price_obj = {"sum": price_str, "currency": {"value": "USD"}}
     
     po_line = {
         "owner": {"value": "OLIN", "desc": "F.W. Olin Library"},
         "type": {
             "value": data['order_type'],
-            "desc": type_descriptions.get(data['order_type'], data['order_type'])
+            "desc": _ORDER_TYPES.get(data['order_type'], data['order_type'])
         },
         "vendor": {"value": data['vendor_code']},
         "vendor_account": data['vendor_account'],
@@ -310,7 +324,7 @@ def create_po_json(data):
         "no_charge": False,
         "rush": False,
         "cancellation_restriction": False,
-        "price": {"sum": price_str, "currency": {"value": "USD"}},
+        "price": price_obj,
         "vendor_reference_number": data['vendor_reference_number'],
         "vendor_reference_number_type": {"value": "IA"},
         "source_type": {"value": "API"},
@@ -324,7 +338,7 @@ def create_po_json(data):
         },
         "fund_distribution": [{
             "fund_code": {"value": data['fund_code']},
-            "amount": {"sum": price_str, "currency": {"value": "USD"}}
+            "amount": price_obj
         }],
         "reporting_code": data['reporting_code'],
         "receiving_note": data['receiving_categories'],
@@ -399,10 +413,20 @@ def validate_price(text):
         return "Price is required"
     try:
         price = float(text.strip())
+        if not math.isfinite(price):
+            return "Please enter a valid price"
         return price > 0 or "Price must be greater than 0"
     except ValueError:
         return "Please enter a valid price"
 
+def validate_quantity(text):
+    """Validate quantity is a positive whole number."""
+    text = text.strip()
+    # isdecimal() rejects characters like '²' that isdigit() accepts but int() cannot parse
+    if not text.isdecimal():
+        return "Must be a positive number"
+    return int(text) > 0 or "Must be a positive number"
+
 def validate_receiving_categories(selected):
     """Validate receiving categories."""
     if not selected:
@@ -411,14 +435,24 @@ def validate_receiving_categories(selected):
         return "Cannot select 'None' with other categories"
     return True
 
-def generate_filename(data):
+def generate_filename(data, *, now: datetime | None = None):
     """Generate filename for JSON output."""
-    clean_title = re.sub(r'[^\w\s-]', '', data['title'])
-    clean_title = re.sub(r'\s+', '_', clean_title.strip())[:30]
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    vendor_ref = re.sub(r'[^\w-]', '', data.get('vendor_reference_number', 'noref'))[:15]
+    clean_title = _RE_TITLE_BAD.sub('', data['title'])
+    clean_title = _RE_WHITESPACE.sub('_', clean_title.strip())[:30]
+    if now is None:
+        now = datetime.now()
+    timestamp = now.strftime('%Y%m%d_%H%M%S')
+    vendor_ref = _RE_VENDOR_BAD.sub('', data.get('vendor_reference_number', 'noref'))[:15]
     return f"po_{clean_title}_{vendor_ref}_{timestamp}.json"
 
+def save_po_file(po_json, filename):
+    """Write PO line JSON to disk in a single write."""
+    # json.dump() with indent emits many small chunks through the text
+    # layer; encoding to one string first keeps the same bytes on disk
+    content = json.dumps(po_json, indent=4, ensure_ascii=False)
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(content)
+
 def display_summary(data, filename):
     """Display order summary."""
     table = Table(title="Order Summary", show_header=True, header_style="bold magenta")
@@ -455,11 +489,152 @@ def display_summary(data, filename):
     table.add_row("File", filename)
     console.print(table)
 
+# =============================================================================
+# BATCH MODE
+# =============================================================================
+
+def read_order_records(path):
+    """Read order records from a CSV file or a JSON Lines (.jsonl) file."""
+    # utf-8-sig drops the BOM Excel writes at the start of saved CSVs
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.lower().endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        return list(csv.DictReader(f))
+
+def order_data_from_record(record):
+    """Build order data (as returned by get_order_information) from a batch record."""
+    if not isinstance(record, dict):
+        raise ValueError("Record is not a JSON object")
+    
+    def field(name, default=''):
+        value = record.get(name)
+        return default if value is None or str(value).strip() == '' else str(value).strip()
+    
+    for name in ('vendor_code', 'vendor_account', 'title'):
+        if not field(name):
+            raise ValueError(f"Missing required field '{name}'")
+    
+    price = field('price')
+    price_check = validate_price(price)
+    if price_check is not True:
+        raise ValueError(price_check)
+    
+    quantity = field('quantity', '1')
+    quantity_check = validate_quantity(quantity)
+    if quantity_check is not True:
+        raise ValueError(quantity_check)
+    
+    reporting_code = field('reporting_code', 'General')
+    if reporting_code not in _SUBJECTS_SET:
+        raise ValueError(f"Invalid reporting code '{reporting_code}'")
+    
+    order_type = field('order_type', 'PRINTED_BOOK_OT')
+    if order_type not in _ORDER_TYPES:
+        raise ValueError(f"Invalid order type '{order_type}'")
+    
+    material_type = field('material_type', 'BOOK')
+    if material_type not in _MATERIAL_TYPES:
+        raise ValueError(f"Invalid material type '{material_type}'")
+    
+    additional_order_ref = field('additional_order_reference')
+    if additional_order_ref not in {c.value for c in _ADDITIONAL_ORDER_REFERENCE_CHOICES}:
+        raise ValueError(f"Invalid additional order reference '{additional_order_ref}'")
+    
+    # Receiving categories use the same "A | B" form the interactive prompt writes
+    receiving_categories = [c.strip() for c in field('receiving_categories', 'None').split('|') if c.strip()]
+    for category in receiving_categories:
+        if category not in _RECEIVING_CATEGORIES:
+            raise ValueError(f"Invalid receiving category '{category}'")
+    categories_check = validate_receiving_categories(receiving_categories)
+    if categories_check is not True:
+        raise ValueError(categories_check)
+    if "Interested User" in receiving_categories:
+        raise ValueError("Interested users are not supported in batch mode")
+    # Notes and their categories must come together, as in the interactive prompts
+    for category, note_field in (("Note", 'additional_notes'), ("Reserve", 'reserve_note')):
+        if category in receiving_categories and not field(note_field):
+            raise ValueError(f"Receiving category '{category}' requires '{note_field}'")
+        if field(note_field) and category not in receiving_categories:
+            raise ValueError(f"'{note_field}' requires receiving category '{category}'")
+    
+    conditional_data = {}
+    if field('additional_notes'):
+        conditional_data['additional_notes'] = field('additional_notes')
+    if field('reserve_note'):
+        conditional_data['reserve_note'] = field('reserve_note')
+    
+    return {
+        'vendor_code': field('vendor_code'),
+        'vendor_account': field('vendor_account'),
+        'vendor_reference_number': field('vendor_reference_number'),
+        'order_type': order_type,
+        'material_type': material_type,
+        'title': field('title'),
+        'author': field('author'),
+        'isbn': field('isbn'),
+        'publisher': field('publisher'),
+        'publication_year': field('publication_year'),
+        'price': price,
+        'quantity': int(quantity),
+        'additional_order_reference': additional_order_ref,
+        'fund_code': field('fund_code', 'rnlds'),
+        'reporting_code': reporting_code,
+        'receiving_categories': " | ".join(receiving_categories),
+        'oclc_number': field('oclc_number') or None,
+        'conditional_data': conditional_data
+    }
+
+def create_po_lines_from_file(path):
+    """Create PO line JSON files for every record in a batch file, without prompting."""
+    try:
+        records = read_order_records(path)
+    except FileNotFoundError:
+        console.print(f"Error: Could not find file '{path}'", style="bold red")
+        sys.exit(1)
+    except (OSError, ValueError) as e:
+        console.print(f"Error reading {path}: {str(e)}", style="bold red")
+        sys.exit(1)
+    
+    console.print(Panel.fit(f"PO Line Creator - batch: {path}", style="bold blue"))
+    
+    # One timestamp for the whole batch: receipt dates and filenames agree
+    now = datetime.now()
+    created_count = 0
+    error_count = 0
+    
+    for i, record in enumerate(records, 1):
+        try:
+            data = order_data_from_record(record)
+            po_json = create_po_json(data, today=now.date())
+            
+            filename = generate_filename(data, now=now)
+            if os.path.exists(filename):
+                # Same title/reference within the same second - keep both
+                root, ext = os.path.splitext(filename)
+                filename = f"{root}_{i}{ext}"
+            
+            save_po_file(po_json, filename)
+            console.print(f"Created: {filename}", style="green")
+            created_count += 1
+        except Exception as e:
+            console.print(f"Error in record {i}: {str(e)}", style="bold red")
+            error_count += 1
+    
+    console.print(f"Records processed: {len(records)}")
+    console.print(f"Successfully created: {created_count}", style="bold green")
+    if error_count:
+        console.print(f"Errors encountered: {error_count}", style="bold red")
+
 # =============================================================================
 # MAIN
 # =============================================================================
 
 def main():
+    # A file argument switches to non-interactive batch mode
+    if len(sys.argv) > 1:
+        create_po_lines_from_file(sys.argv[1])
+        return
+    
     config = AlmaConfig.from_env()
     console.print("Configuration loaded successfully", style="green")
     console.print(Panel.fit("PO Line Creator", style="bold blue"))
@@ -470,9 +645,10 @@ def main():
         if not data:
             continue
         
-        # Generate JSON
-        po_json = create_po_json(data)
-        filename = generate_filename(data)
+        # Generate JSON (one timestamp for both the receipt date and filename)
+        now = datetime.now()
+        po_json = create_po_json(data, today=now.date())
+        filename = generate_filename(data, now=now)
         
         # Show summary
         display_summary(data, filename)
@@ -480,8 +656,7 @@ def main():
         # Confirm and save
         if questionary.confirm(f"Save this PO to {filename}?").ask():
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(po_json, f, indent=4, ensure_ascii=False)
+                save_po_file(po_json, filename)
                 console.print(f"Successfully created: {filename}", style="bold green")
             except Exception as e:
                 console.print(f"Error saving file: {str(e)}", style="bold red")